@@ -1,27 +1,129 @@
 """
 Database models and operations for FRBSF Economic Letters application
 """
+import asyncio
 import hashlib
-from datetime import datetime, timedelta
-from typing import List, Optional, Dict, Any
-from sqlalchemy import create_engine, Column, Integer, String, Text, DateTime, Boolean, Index
+import os
+import time
+from contextvars import ContextVar
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, List, Optional, Union
+from sqlalchemy import create_engine, event, inspect, bindparam, cast, delete, literal_column, select, text, update, Column, Integer, String, Text, LargeBinary, DateTime, Boolean, ForeignKey, Index
+from sqlalchemy.engine import Connection, Engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker, Session
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import sessionmaker, relationship, raiseload, Session
+from sqlalchemy.pool import QueuePool
 from sqlalchemy.sql import func
 import json
-import aiosqlite
-import asyncio
+import queue
+import threading
+from concurrent.futures import Future
+from cachetools import TTLCache
+import zstandard
 
 # Database configuration
 DATABASE_URL = "sqlite:///./economic_letters.db"
 CACHE_EXPIRY_HOURS = 24  # Cache expires after 24 hours
+CACHE_MIN_EXPIRY_HOURS = 1  # Lower bound when new letters arrive in quick succession
+REFRESH_BATCH_GAP_SECONDS = 60  # scraped_at values closer than this belong to the same refresh
+CONTENT_ZSTD_LEVEL = 3  # zstd level for stored letter content
+WRITE_BATCH_SIZE = 32  # Most queued writes committed in one transaction
+CACHE_VALIDITY_MEMO_SECONDS = 60  # How long a cache validity check is memoized in-process
+
+# Query-count diagnostics (set DEBUG_QUERY_COUNT=1 to log requests issuing many SQL statements)
+DEBUG_QUERY_COUNT = os.getenv("DEBUG_QUERY_COUNT", "").lower() in ("1", "true", "yes")
+QUERY_COUNT_WARN_THRESHOLD = 5
 
 # SQLAlchemy setup
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+engine = create_engine(
+    DATABASE_URL,
+    connect_args={"check_same_thread": False},
+    poolclass=QueuePool,
+    pool_size=5,
+    pool_recycle=3600,
+)
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 Base = declarative_base()
 
 
+def unix_now() -> int:
+    """Current time as an integer Unix timestamp"""
+    return int(time.time())
+
+
+# zstd (de)compressors are not safe to share across threads, so each thread keeps its own
+_zstd = threading.local()
+
+
+def compress_content(content: str) -> bytes:
+    """Compress letter text for storage"""
+    compressor = getattr(_zstd, "compressor", None)
+    if compressor is None:
+        compressor = _zstd.compressor = zstandard.ZstdCompressor(level=CONTENT_ZSTD_LEVEL)
+    return compressor.compress(content.encode())
+
+
+def decompress_content(content_zstd: bytes) -> str:
+    """Decompress letter text stored by compress_content"""
+    decompressor = getattr(_zstd, "decompressor", None)
+    if decompressor is None:
+        decompressor = _zstd.decompressor = zstandard.ZstdDecompressor()
+    return decompressor.decompress(content_zstd).decode()
+
+
+# Current Unix timestamp, evaluated by SQLite
+SQL_UNIX_NOW = cast(func.strftime('%s', 'now'), Integer)
+
+
+@lru_cache(maxsize=1024)
+def _hash_question_cached(question: str) -> bytes:
+    """BLAKE2b-128 digest of a normalized question, memoized for repeated questions"""
+    return hashlib.blake2b(question.strip().casefold().encode(), digest_size=16).digest()
+
+
+@event.listens_for(engine, "connect")
+def _set_sqlite_pragmas(dbapi_conn, _):
+    """Tune each new SQLite connection: WAL journal, relaxed fsync, bigger page cache"""
+    cursor = dbapi_conn.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA temp_store=MEMORY")
+    cursor.execute("PRAGMA cache_size=-64000")  # ~64MB page cache
+    cursor.execute("PRAGMA mmap_size=268435456")  # 256MB memory-mapped I/O
+    cursor.execute("PRAGMA foreign_keys=ON")
+    cursor.close()
+
+
+class QueryCounter:
+    """Number of SQL statements executed while this counter is active"""
+    
+    def __init__(self):
+        self.count = 0
+
+
+# Holds a mutable counter so statements run in child tasks are still counted
+_active_query_counter: ContextVar[Optional[QueryCounter]] = ContextVar("active_query_counter", default=None)
+
+
+def start_query_counter() -> QueryCounter:
+    """Start counting SQL statements executed in the current context"""
+    counter = QueryCounter()
+    _active_query_counter.set(counter)
+    return counter
+
+
+def _count_query(conn, cursor, statement, parameters, context, executemany):
+    counter = _active_query_counter.get()
+    if counter is not None:
+        counter.count += 1
+
+
+if DEBUG_QUERY_COUNT:
+    event.listen(engine, "before_cursor_execute", _count_query)
+
+
 class EconomicLetter(Base):
     """Model for storing economic letters"""
     __tablename__ = "economic_letters"
@@ -30,15 +132,19 @@ class EconomicLetter(Base):
     url = Column(String, unique=True, index=True, nullable=False)
     title = Column(String, nullable=False)
     date = Column(String, nullable=False)
-    content = Column(Text, nullable=False)
+    content_zstd = Column(LargeBinary, nullable=False)  # zstd-compressed letter text, see compress_content
     summary = Column(Text, nullable=False)
-    scraped_at = Column(DateTime, default=datetime.utcnow)
-    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+    scraped_at = Column(DateTime, server_default=func.now(), nullable=False)
+    updated_at = Column(DateTime, server_default=func.now(), server_onupdate=func.now(), nullable=False)
+    
+    insights = relationship("Insight", back_populates="letter", passive_deletes=True)
     
     # Add index for faster queries
     __table_args__ = (
         Index('idx_url_scraped', 'url', 'scraped_at'),
         Index('idx_date_scraped', 'date', 'scraped_at'),
+        # Covering index for the paginated listing, which never reads content
+        Index('idx_letters_scraped_cov', scraped_at.desc(), 'url', 'title', 'date', 'summary'),
     )
 
 
@@ -46,16 +152,18 @@ class Insight(Base):
     """Model for storing AI-generated insights"""
     __tablename__ = "insights"
     
-    id = Column(Integer, primary_key=True, index=True)
-    letter_url = Column(String, nullable=False, index=True)
+    id = Column(Integer, primary_key=True)
+    letter_id = Column(Integer, ForeignKey('economic_letters.id', ondelete='CASCADE'), nullable=False, index=True)
     question = Column(Text, nullable=False)
-    question_hash = Column(String, nullable=False, index=True)  # Hash of question for quick lookup
+    question_hash = Column(LargeBinary(16), nullable=False, index=True)  # BLAKE2b-128 digest of question for quick lookup
     insight = Column(Text, nullable=False)
-    created_at = Column(DateTime, default=datetime.utcnow)
+    created_at = Column(Integer, server_default=SQL_UNIX_NOW, nullable=False)  # Unix timestamp
+    
+    letter = relationship("EconomicLetter", back_populates="insights")
     
-    # Add composite index for faster lookups
+    # Composite unique index for faster lookups and UPSERT conflict detection
     __table_args__ = (
-        Index('idx_letter_question', 'letter_url', 'question_hash'),
+        Index('idx_insight_lid_qhash', 'letter_id', 'question_hash', unique=True),
     )
 
 
@@ -63,25 +171,303 @@ class CacheMetadata(Base):
     """Model for tracking cache status and metadata"""
     __tablename__ = "cache_metadata"
     
-    id = Column(Integer, primary_key=True, index=True)
-    cache_key = Column(String, unique=True, index=True, nullable=False)
+    cache_key = Column(String, primary_key=True)
     cache_type = Column(String, nullable=False)  # 'letters_list', 'letter_content', etc.
-    last_updated = Column(DateTime, default=datetime.utcnow)
-    expires_at = Column(DateTime, nullable=False)
+    last_updated = Column(Integer, server_default=SQL_UNIX_NOW, server_onupdate=SQL_UNIX_NOW)  # Unix timestamp
+    expires_at = Column(Integer, nullable=False)  # Unix timestamp
     is_valid = Column(Boolean, default=True)
     extra_data = Column(Text)  # JSON string for additional metadata
+    
+    # Lookups are always by cache_key, so store rows in its B-tree directly
+    __table_args__ = {'sqlite_with_rowid': False}
+
+
+# Core statements for hot read paths; they skip the ORM and their compiled SQL is cached
+_IS_CACHE_VALID = select(CacheMetadata.cache_key).where(
+    CacheMetadata.cache_key == bindparam("cache_key"),
+    CacheMetadata.expires_at > bindparam("now"),
+    CacheMetadata.is_valid == True
+)
+_GET_LETTER_ID = select(EconomicLetter.id).where(EconomicLetter.url == bindparam("url"))
+_GET_INSIGHT = select(Insight.insight).where(
+    Insight.letter_id == bindparam("letter_id"),
+    Insight.question_hash == bindparam("question_hash")
+)
+
+# All cache statistics, including the database size in bytes, in one round trip
+_CACHE_STATS = select(
+    select(func.count()).select_from(EconomicLetter).scalar_subquery().label("total_letters"),
+    select(func.count()).select_from(Insight).scalar_subquery().label("total_insights"),
+    select(func.count()).select_from(CacheMetadata).where(
+        CacheMetadata.is_valid == True,
+        CacheMetadata.expires_at > bindparam("now")
+    ).scalar_subquery().label("valid_caches"),
+    literal_column(
+        "(SELECT page_count * page_size FROM pragma_page_count(), pragma_page_size())"
+    ).label("database_size")
+)
+
+
+# Gap in seconds between the latest refresh that found new letters and the one before it.
+# Letters stored one by one (as older versions did) get scraped_at values a few seconds
+# apart, so smaller gaps are treated as part of the same refresh.
+_scraped_at_gap = (
+    func.julianday(EconomicLetter.scraped_at)
+    - func.julianday(func.lead(EconomicLetter.scraped_at).over(
+        order_by=EconomicLetter.scraped_at.desc()
+    ))
+) * 86400
+_scraped_at_gaps = select(
+    EconomicLetter.scraped_at,
+    _scraped_at_gap.label("gap")
+).subquery()
+_LATEST_REFRESH_GAP = select(cast(_scraped_at_gaps.c.gap, Integer)).where(
+    _scraped_at_gaps.c.gap >= REFRESH_BATCH_GAP_SECONDS
+).order_by(_scraped_at_gaps.c.scraped_at.desc()).limit(1)
+
+
+class WriteQueue:
+    """Single writer thread that applies queued writes in batched transactions
+    
+    SQLite allows one writer at a time, so all writes go through one thread.
+    Writes queued while a batch is in flight are committed together, each
+    inside its own savepoint so a failing write does not undo the others.
+    Writes get a plain Connection and use Core statements, not the ORM.
+    """
+    
+    def __init__(self, bind: Engine, max_batch: int = WRITE_BATCH_SIZE):
+        self.bind = bind
+        self.max_batch = max_batch
+        self._queue: "queue.Queue[tuple[Callable[..., Any], tuple, Future]]" = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name="sqlite-writer", daemon=True)
+        self._thread.start()
+    
+    def submit(self, write: Callable[..., Any], *args) -> Future:
+        """Queue write(connection, *args); the Future resolves once it is committed"""
+        future: Future = Future()
+        self._queue.put((write, args, future))
+        return future
+    
+    def _run(self):
+        while True:
+            try:
+                batch = [self._queue.get()]
+                while len(batch) < self.max_batch:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                self._apply(batch)
+            except Exception as e:
+                # Keep the writer alive; otherwise every later write would wait forever
+                print(f"Error in database writer: {e}")
+    
+    def _apply(self, batch):
+        # Skip writes whose callers gave up waiting; the rest can no longer be cancelled
+        batch = [item for item in batch if item[2].set_running_or_notify_cancel()]
+        if not batch:
+            return
+        
+        results = []
+        try:
+            with self.bind.connect() as conn:
+                try:
+                    # Take the write lock up front instead of upgrading from a read lock
+                    conn.exec_driver_sql("BEGIN IMMEDIATE")
+                    for write, args, future in batch:
+                        try:
+                            with conn.begin_nested():
+                                results.append((future, write(conn, *args), None))
+                        except Exception as e:
+                            results.append((future, None, e))
+                    conn.commit()
+                except Exception:
+                    conn.rollback()
+                    raise
+        except Exception as e:
+            # Nothing was committed, including when connecting or rolling back failed
+            for _, _, future in batch:
+                future.set_exception(e)
+            return
+        
+        for future, result, error in results:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
 
 
 class DatabaseManager:
-    """Database operations manager"""
+    """Database operations manager
+    
+    ORM queries use raiseload('*') so an accidental lazy load raises instead of
+    issuing extra queries; load relationships explicitly with selectinload().
+    """
     
     def __init__(self):
         self.engine = engine
         self.SessionLocal = SessionLocal
+        self.write_queue = WriteQueue(engine)
+        # Letter URL -> id lookups; ids never change once a letter is stored
+        self._letter_ids: Dict[str, int] = {}
+        # Memoized is_cache_valid results so paging through a listing skips the metadata query
+        self._cache_valid = TTLCache(maxsize=16, ttl=CACHE_VALIDITY_MEMO_SECONDS)
     
     def create_tables(self):
         """Create all database tables"""
         Base.metadata.create_all(bind=self.engine)
+        self._migrate()
+    
+    def _migrate(self):
+        """Bring tables created by older versions up to the current schema"""
+        inspector = inspect(self.engine)
+        
+        letter_columns = {column["name"]: column for column in inspector.get_columns("economic_letters")}
+        
+        # Content used to be plain TEXT; compress it into a new column before the rebuild drops it
+        if "content_zstd" not in letter_columns:
+            with self.engine.begin() as conn:
+                conn.exec_driver_sql("BEGIN")
+                conn.exec_driver_sql("ALTER TABLE economic_letters ADD COLUMN content_zstd BLOB")
+                legacy_rows = conn.execute(text("SELECT id, content FROM economic_letters")).all()
+                if legacy_rows:
+                    conn.execute(
+                        text("UPDATE economic_letters SET content_zstd = :content_zstd WHERE id = :id"),
+                        [
+                            {"id": row.id, "content_zstd": compress_content(row.content)}
+                            for row in legacy_rows
+                        ]
+                    )
+        
+        # Timestamp defaults used to be filled in by Python; SQLite cannot add them in place
+        if "content" in letter_columns or letter_columns["scraped_at"]["default"] is None:
+            self._rebuild_table(
+                EconomicLetter,
+                "INSERT INTO economic_letters "
+                "(id, url, title, date, content_zstd, summary, scraped_at, updated_at) "
+                "SELECT id, url, title, date, content_zstd, summary, "
+                "COALESCE(scraped_at, CURRENT_TIMESTAMP), COALESCE(updated_at, CURRENT_TIMESTAMP) "
+                "FROM {legacy}"
+            )
+        
+        # Insights used to reference letters by URL and store DateTime strings;
+        # legacy rows may lack timestamps, which are now NOT NULL
+        insight_columns = {column["name"]: column for column in inspector.get_columns("insights")}
+        if "letter_id" not in insight_columns:
+            self._rebuild_table(
+                Insight,
+                "INSERT INTO insights (id, letter_id, question, question_hash, insight, created_at) "
+                "SELECT i.id, l.id, i.question, i.question_hash, i.insight, "
+                "COALESCE(CAST(strftime('%s', i.created_at) AS INTEGER), "
+                "CAST(strftime('%s', 'now') AS INTEGER)) "
+                "FROM {legacy} i JOIN economic_letters l ON l.url = i.letter_url "
+                "WHERE i.id IN (SELECT MAX(id) FROM {legacy} GROUP BY letter_url, question_hash)"
+            )
+        elif insight_columns["created_at"]["default"] is None:
+            self._rebuild_table(
+                Insight,
+                "INSERT INTO insights (id, letter_id, question, question_hash, insight, created_at) "
+                "SELECT id, letter_id, question, question_hash, insight, "
+                "COALESCE(created_at, CAST(strftime('%s', 'now') AS INTEGER)) FROM {legacy}"
+            )
+        
+        # cache_metadata used to have a surrogate id and DateTime columns;
+        # entries without an expiry are carried over as already expired
+        cache_columns = {column["name"]: column for column in inspector.get_columns("cache_metadata")}
+        if "id" in cache_columns:
+            self._rebuild_table(
+                CacheMetadata,
+                "INSERT INTO cache_metadata "
+                "(cache_key, cache_type, last_updated, expires_at, is_valid, extra_data) "
+                "SELECT cache_key, cache_type, "
+                "COALESCE(CAST(strftime('%s', last_updated) AS INTEGER), "
+                "CAST(strftime('%s', 'now') AS INTEGER)), "
+                "COALESCE(CAST(strftime('%s', expires_at) AS INTEGER), 0), is_valid, extra_data "
+                "FROM {legacy}"
+            )
+        elif cache_columns["last_updated"]["default"] is None:
+            self._rebuild_table(
+                CacheMetadata,
+                "INSERT INTO cache_metadata "
+                "(cache_key, cache_type, last_updated, expires_at, is_valid, extra_data) "
+                "SELECT cache_key, cache_type, "
+                "COALESCE(last_updated, CAST(strftime('%s', 'now') AS INTEGER)), "
+                "COALESCE(expires_at, 0), is_valid, extra_data "
+                "FROM {legacy}"
+            )
+        
+        # create_all only builds indexes together with new tables
+        for table in Base.metadata.sorted_tables:
+            for index in table.indexes:
+                index.create(bind=self.engine, checkfirst=True)
+        
+        # Question hashes used to be MD5 hex strings; rehash them to BLAKE2b bytes.
+        # Questions that were distinct under the old lower() normalization can collide
+        # under casefold(), e.g. "Straße?" and "STRASSE?"; keep the newest insight of each.
+        with self.engine.begin() as conn:
+            has_legacy_rows = conn.execute(text(
+                "SELECT 1 FROM insights WHERE typeof(question_hash) = 'text' LIMIT 1"
+            )).first()
+            if has_legacy_rows:
+                rows = conn.execute(text(
+                    "SELECT id, letter_id, question, question_hash, "
+                    "typeof(question_hash) = 'text' AS is_legacy FROM insights"
+                )).all()
+                latest_ids = {}
+                new_hashes = {}
+                for row in rows:
+                    question_hash = row.question_hash
+                    if row.is_legacy:
+                        question_hash = new_hashes[row.id] = self._hash_question(row.question)
+                    key = (row.letter_id, question_hash)
+                    latest_ids[key] = max(latest_ids.get(key, row.id), row.id)
+                
+                kept_ids = set(latest_ids.values())
+                stale_ids = [row.id for row in rows if row.id not in kept_ids]
+                if stale_ids:
+                    conn.execute(
+                        text("DELETE FROM insights WHERE id = :id"),
+                        [{"id": insight_id} for insight_id in stale_ids]
+                    )
+                rehashed = [
+                    {"id": insight_id, "question_hash": question_hash}
+                    for insight_id, question_hash in new_hashes.items()
+                    if insight_id in kept_ids
+                ]
+                if rehashed:
+                    conn.execute(
+                        text("UPDATE insights SET question_hash = :question_hash WHERE id = :id"),
+                        rehashed
+                    )
+    
+    def _rebuild_table(self, model, copy_sql: str):
+        """Recreate a table from its model and copy the old rows with copy_sql
+        
+        copy_sql is an INSERT ... SELECT reading from the {legacy} placeholder.
+        """
+        table = model.__table__
+        legacy_name = f"{table.name}_legacy"
+        legacy_indexes = inspect(self.engine).get_indexes(table.name)
+        
+        with self.engine.connect() as conn:
+            # Keep foreign keys that point at this table attached to it while it is swapped
+            conn.exec_driver_sql("PRAGMA foreign_keys=OFF")
+            conn.exec_driver_sql("PRAGMA legacy_alter_table=ON")
+            try:
+                # pysqlite only opens transactions for DML; make the DDL below atomic too
+                conn.exec_driver_sql("BEGIN")
+                conn.exec_driver_sql(f'ALTER TABLE "{table.name}" RENAME TO "{legacy_name}"')
+                for index in legacy_indexes:
+                    conn.exec_driver_sql(f'DROP INDEX IF EXISTS "{index["name"]}"')
+                table.create(bind=conn)
+                conn.exec_driver_sql(copy_sql.format(legacy=f'"{legacy_name}"'))
+                conn.exec_driver_sql(f'DROP TABLE "{legacy_name}"')
+                conn.commit()
+            finally:
+                conn.rollback()
+                conn.exec_driver_sql("PRAGMA legacy_alter_table=OFF")
+                conn.exec_driver_sql("PRAGMA foreign_keys=ON")
+                conn.commit()
     
     def get_db(self) -> Session:
         """Get database session"""
@@ -99,244 +485,280 @@ class DatabaseManager:
     # Economic Letters operations
     def get_letters_from_cache(self, limit: int = 10, offset: int = 0) -> tuple[List[Dict[str, Any]], bool]:
         """Get cached economic letters with pagination"""
+        # Check if cache is still valid
+        if not self.is_cache_valid("letters_list"):
+            return [], False
+        
         db = self.get_db()
         try:
-            # Check if cache is still valid
-            cache_key = "letters_list"
-            cache_entry = db.query(CacheMetadata).filter(
-                CacheMetadata.cache_key == cache_key,
-                CacheMetadata.expires_at > datetime.utcnow(),
-                CacheMetadata.is_valid == True
-            ).first()
-            
-            if not cache_entry:
-                return [], False
-            
-            # Get letters from database with pagination
-            letters_query = db.query(EconomicLetter).order_by(
-                EconomicLetter.scraped_at.desc()
-            )
-            
-            # Get total count for has_more calculation
-            total_count = letters_query.count()
-            
-            # Apply pagination
-            letters = letters_query.offset(offset).limit(limit).all()
+            # Get one page of letters plus the total count in a single query
+            stmt = select(
+                EconomicLetter.title,
+                EconomicLetter.url,
+                EconomicLetter.date,
+                EconomicLetter.summary,
+                func.count().over().label("total")
+            ).order_by(
+                # Letters stored by one UPSERT share scraped_at; keep their insertion order
+                EconomicLetter.scraped_at.desc(),
+                EconomicLetter.id.desc()
+            ).offset(offset).limit(limit)
+            rows = db.execute(stmt).all()
             
             # Check if there are more letters
-            has_more = (offset + limit) < total_count
+            total_count = rows[0].total if rows else 0
+            has_more = (offset + len(rows)) < total_count
             
+            # Content is left out of the listing; fetch it with get_letter
             letters_data = [
                 {
-                    "title": letter.title,
-                    "url": letter.url,
-                    "date": letter.date,
-                    "summary": letter.summary,
-                    "content": letter.content
+                    "title": row.title,
+                    "url": row.url,
+                    "date": row.date,
+                    "summary": row.summary
                 }
-                for letter in letters
+                for row in rows
             ]
             
             return letters_data, has_more
         finally:
             self.close_db(db)
     
-    def store_letters(self, letters_data: List[Dict[str, Any]]) -> bool:
-        """Store economic letters in database"""
+    def get_letter(self, url: str) -> Optional[Dict[str, Any]]:
+        """Get a single cached economic letter, including its full content"""
         db = self.get_db()
         try:
-            # Store or update letters
-            for letter_data in letters_data:
-                existing_letter = db.query(EconomicLetter).filter(
-                    EconomicLetter.url == letter_data["url"]
-                ).first()
-                
-                if existing_letter:
-                    # Update existing letter
-                    existing_letter.title = letter_data["title"]
-                    existing_letter.date = letter_data["date"]
-                    existing_letter.content = letter_data["content"]
-                    existing_letter.summary = letter_data["summary"]
-                    existing_letter.updated_at = datetime.utcnow()
-                else:
-                    # Create new letter
-                    new_letter = EconomicLetter(
-                        url=letter_data["url"],
-                        title=letter_data["title"],
-                        date=letter_data["date"],
-                        content=letter_data["content"],
-                        summary=letter_data["summary"]
-                    )
-                    db.add(new_letter)
-            
-            # Update cache metadata
-            cache_key = "letters_list"
-            cache_entry = db.query(CacheMetadata).filter(
-                CacheMetadata.cache_key == cache_key
-            ).first()
-            
-            expires_at = datetime.utcnow() + timedelta(hours=CACHE_EXPIRY_HOURS)
-            
-            if cache_entry:
-                cache_entry.last_updated = datetime.utcnow()
-                cache_entry.expires_at = expires_at
-                cache_entry.is_valid = True
-            else:
-                new_cache = CacheMetadata(
-                    cache_key=cache_key,
-                    cache_type="letters_list",
-                    expires_at=expires_at,
-                    extra_data=json.dumps({"count": len(letters_data)})
-                )
-                db.add(new_cache)
+            letter = db.query(EconomicLetter).options(raiseload('*')).filter(EconomicLetter.url == url).first()
+            if not letter:
+                return None
             
-            db.commit()
+            return {
+                "title": letter.title,
+                "url": letter.url,
+                "date": letter.date,
+                "summary": letter.summary,
+                "content": decompress_content(letter.content_zstd)
+            }
+        finally:
+            self.close_db(db)
+    
+    async def store_letters(self, letters_data: List[Dict[str, Any]]) -> bool:
+        """Store economic letters in database"""
+        try:
+            await asyncio.wrap_future(self.write_queue.submit(self._write_letters, letters_data))
+            self._cache_valid.pop("letters_list", None)
             return True
         except Exception as e:
-            db.rollback()
             print(f"Error storing letters: {e}")
             return False
-        finally:
-            self.close_db(db)
+    
+    def _write_letters(self, conn: Connection, letters_data: List[Dict[str, Any]]):
+        """Upsert letters and refresh the letters_list cache entry (runs on the writer thread)"""
+        # Store or update all letters in a single UPSERT statement
+        if letters_data:
+            rows = [
+                {
+                    "url": letter_data["url"],
+                    "title": letter_data["title"],
+                    "date": letter_data["date"],
+                    "content_zstd": compress_content(letter_data["content"]),
+                    "summary": letter_data["summary"]
+                }
+                for letter_data in letters_data
+            ]
+            stmt = sqlite_insert(EconomicLetter).values(rows)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[EconomicLetter.url],
+                set_={
+                    "title": stmt.excluded.title,
+                    "date": stmt.excluded.date,
+                    "content_zstd": stmt.excluded.content_zstd,
+                    "summary": stmt.excluded.summary,
+                    "updated_at": func.now()
+                }
+            )
+            conn.execute(stmt)
+        
+        # Expire sooner when new letters have been showing up frequently
+        publish_interval = self._observed_publish_interval(conn)
+        expiry_seconds = CACHE_EXPIRY_HOURS * 3600
+        if publish_interval is not None:
+            expiry_seconds = max(
+                min(expiry_seconds, publish_interval // 2),
+                CACHE_MIN_EXPIRY_HOURS * 3600
+            )
+        expires_at = unix_now() + expiry_seconds
+        extra_data = json.dumps({
+            "count": len(letters_data),
+            "publish_interval_seconds": publish_interval
+        })
+        
+        # Update cache metadata
+        stmt = sqlite_insert(CacheMetadata).values(
+            cache_key="letters_list",
+            cache_type="letters_list",
+            expires_at=expires_at,
+            is_valid=True,
+            extra_data=extra_data
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[CacheMetadata.cache_key],
+            set_={
+                "last_updated": SQL_UNIX_NOW,
+                "expires_at": stmt.excluded.expires_at,
+                "is_valid": True,
+                "extra_data": stmt.excluded.extra_data
+            }
+        )
+        conn.execute(stmt)
+    
+    def _observed_publish_interval(self, conn: Connection) -> Optional[int]:
+        """Seconds between the two latest refreshes that found new letters, if known
+        
+        scraped_at is only set when a letter is first stored, so bursts of
+        scraped_at values mark when newly published letters appeared.
+        """
+        return conn.execute(_LATEST_REFRESH_GAP).scalar()
     
     def is_cache_valid(self, cache_key: str) -> bool:
         """Check if cache is still valid"""
-        db = self.get_db()
-        try:
-            cache_entry = db.query(CacheMetadata).filter(
-                CacheMetadata.cache_key == cache_key,
-                CacheMetadata.expires_at > datetime.utcnow(),
-                CacheMetadata.is_valid == True
-            ).first()
-            return cache_entry is not None
-        finally:
-            self.close_db(db)
+        is_valid = self._cache_valid.get(cache_key)
+        if is_valid is not None:
+            return is_valid
+        
+        with self.engine.connect() as conn:
+            is_valid = conn.execute(
+                _IS_CACHE_VALID, {"cache_key": cache_key, "now": unix_now()}
+            ).first() is not None
+        self._cache_valid[cache_key] = is_valid
+        return is_valid
     
     # Insights operations
     def get_cached_insight(self, letter_url: str, question: str) -> Optional[str]:
         """Get cached insight for a specific question about a letter"""
-        db = self.get_db()
-        try:
-            question_hash = self._hash_question(question)
-            insight = db.query(Insight).filter(
-                Insight.letter_url == letter_url,
-                Insight.question_hash == question_hash
-            ).first()
+        with self.engine.connect() as conn:
+            letter_id = self._get_letter_id(conn, letter_url)
+            if letter_id is None:
+                return None
             
-            return insight.insight if insight else None
-        finally:
-            self.close_db(db)
+            return conn.execute(
+                _GET_INSIGHT,
+                {"letter_id": letter_id, "question_hash": self._hash_question(question)}
+            ).scalar()
     
-    def store_insight(self, letter_url: str, question: str, insight_text: str) -> bool:
+    async def store_insight(self, letter_url: str, question: str, insight_text: str) -> bool:
         """Store an AI-generated insight"""
-        db = self.get_db()
         try:
-            question_hash = self._hash_question(question)
+            with self.engine.connect() as conn:
+                letter_id = self._get_letter_id(conn, letter_url)
+            if letter_id is None:
+                print(f"Error storing insight: letter not found: {letter_url}")
+                return False
             
-            # Check if insight already exists
-            existing_insight = db.query(Insight).filter(
-                Insight.letter_url == letter_url,
-                Insight.question_hash == question_hash
-            ).first()
-            
-            if existing_insight:
-                # Update existing insight
-                existing_insight.insight = insight_text
-                existing_insight.created_at = datetime.utcnow()
-            else:
-                # Create new insight
-                new_insight = Insight(
-                    letter_url=letter_url,
-                    question=question,
-                    question_hash=question_hash,
-                    insight=insight_text
-                )
-                db.add(new_insight)
-            
-            db.commit()
+            await asyncio.wrap_future(self.write_queue.submit(
+                self._write_insight, letter_id, question, insight_text
+            ))
             return True
         except Exception as e:
-            db.rollback()
             print(f"Error storing insight: {e}")
             return False
-        finally:
-            self.close_db(db)
     
-    def _hash_question(self, question: str) -> str:
+    def _write_insight(self, conn: Connection, letter_id: int, question: str, insight_text: str) -> int:
+        """Insert, or refresh the existing insight for the same question, returning its id (runs on the writer thread)"""
+        question_hash = self._hash_question(question)
+        stmt = sqlite_insert(Insight).values(
+            letter_id=letter_id,
+            question=question,
+            question_hash=question_hash,
+            insight=insight_text
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[Insight.letter_id, Insight.question_hash],
+            set_={
+                "insight": stmt.excluded.insight,
+                "created_at": SQL_UNIX_NOW
+            }
+        ).returning(Insight.id)
+        return conn.execute(stmt).scalar_one()
+    
+    def _get_letter_id(self, db: Union[Session, Connection], letter_url: str) -> Optional[int]:
+        """Resolve a letter URL to its id, caching hits"""
+        letter_id = self._letter_ids.get(letter_url)
+        if letter_id is None:
+            letter_id = db.execute(_GET_LETTER_ID, {"url": letter_url}).scalar()
+            if letter_id is not None:
+                self._letter_ids[letter_url] = letter_id
+        return letter_id
+    
+    def _hash_question(self, question: str) -> bytes:
         """Create a hash of the question for efficient lookups"""
-        return hashlib.md5(question.lower().strip().encode()).hexdigest()
+        return _hash_question_cached(question)
     
     # Question history operations
     def get_question_history(self, letter_url: str) -> List[Dict[str, Any]]:
         """Get question history for a specific letter"""
         db = self.get_db()
         try:
-            insights = db.query(Insight).filter(
-                Insight.letter_url == letter_url
-            ).order_by(Insight.created_at.desc()).all()
+            letter_id = self._get_letter_id(db, letter_url)
+            if letter_id is None:
+                return []
+            
+            insights = db.query(Insight).options(raiseload('*')).filter(
+                Insight.letter_id == letter_id
+            ).order_by(Insight.created_at.desc(), Insight.id.desc()).all()
             
             return [
                 {
                     "id": insight.id,
                     "question": insight.question,
                     "insight": insight.insight,
-                    "created_at": insight.created_at.isoformat()
+                    "created_at": datetime.utcfromtimestamp(insight.created_at).isoformat()
                 }
                 for insight in insights
             ]
         finally:
             self.close_db(db)
     
-    def delete_question(self, question_id: int) -> bool:
+    async def delete_question(self, question_id: int) -> bool:
         """Delete a specific question and its insight"""
-        db = self.get_db()
         try:
-            insight = db.query(Insight).filter(Insight.id == question_id).first()
-            if insight:
-                db.delete(insight)
-                db.commit()
-                return True
-            return False
+            return await asyncio.wrap_future(
+                self.write_queue.submit(self._write_delete_question, question_id)
+            )
         except Exception as e:
-            db.rollback()
             print(f"Error deleting question: {e}")
             return False
-        finally:
-            self.close_db(db)
+    
+    def _write_delete_question(self, conn: Connection, question_id: int) -> bool:
+        """Delete an insight by id, reporting whether it existed (runs on the writer thread)"""
+        result = conn.execute(delete(Insight).where(Insight.id == question_id))
+        return result.rowcount > 0
     
     # Cache management
-    def clear_cache(self, cache_type: Optional[str] = None):
+    async def clear_cache(self, cache_type: Optional[str] = None):
         """Clear cache entries"""
-        db = self.get_db()
-        try:
-            query = db.query(CacheMetadata)
-            if cache_type:
-                query = query.filter(CacheMetadata.cache_type == cache_type)
-            
-            query.update({"is_valid": False})
-            db.commit()
-        finally:
-            self.close_db(db)
+        await asyncio.wrap_future(self.write_queue.submit(self._write_clear_cache, cache_type))
+        self._cache_valid.clear()
+    
+    def _write_clear_cache(self, conn: Connection, cache_type: Optional[str]):
+        """Mark cache entries invalid (runs on the writer thread)"""
+        stmt = update(CacheMetadata).values(is_valid=False)
+        if cache_type:
+            stmt = stmt.where(CacheMetadata.cache_type == cache_type)
+        
+        conn.execute(stmt)
     
     def get_cache_stats(self) -> Dict[str, Any]:
         """Get cache statistics"""
-        db = self.get_db()
-        try:
-            total_letters = db.query(EconomicLetter).count()
-            total_insights = db.query(Insight).count()
-            valid_caches = db.query(CacheMetadata).filter(
-                CacheMetadata.is_valid == True,
-                CacheMetadata.expires_at > datetime.utcnow()
-            ).count()
-            
-            return {
-                "total_letters": total_letters,
-                "total_insights": total_insights,
-                "valid_caches": valid_caches,
-                "database_size": "N/A"  # Could implement file size check
-            }
-        finally:
-            self.close_db(db)
+        with self.engine.connect() as conn:
+            stats = conn.execute(_CACHE_STATS, {"now": unix_now()}).one()
+        
+        return {
+            "total_letters": stats.total_letters,
+            "total_insights": stats.total_insights,
+            "valid_caches": stats.valid_caches,
+            "database_size": stats.database_size  # Bytes
+        }
 
 
 # Global database manager instance
@@ -1,15 +1,24 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.responses import HTMLResponse
-import requests
+import asyncio
+import httpx
 from bs4 import BeautifulSoup
+import lxml.html
+from lxml.cssselect import CSSSelector
 import boto3
-import json
+import orjson
 from typing import List, Dict
 from pydantic import BaseModel
 import re
 from datetime import datetime
-from database import init_database, get_database_manager
+from database import (
+    init_database,
+    get_database_manager,
+    start_query_counter,
+    DEBUG_QUERY_COUNT,
+    QUERY_COUNT_WARN_THRESHOLD,
+)
 
 from contextlib import asynccontextmanager
 
@@ -25,6 +34,16 @@ app = FastAPI(
     lifespan=lifespan
 )
 
+if DEBUG_QUERY_COUNT:
+    @app.middleware("http")
+    async def log_query_count(request: Request, call_next):
+        """Log requests that issue more SQL statements than expected"""
+        counter = start_query_counter()
+        response = await call_next(request)
+        if counter.count > QUERY_COUNT_WARN_THRESHOLD:
+            print(f"⚠️  {request.method} {request.url.path} ran {counter.count} SQL statements")
+        return response
+
 # Mount static files
 app.mount("/static", StaticFiles(directory="static"), name="static")
 
@@ -34,6 +53,45 @@ db_manager = get_database_manager()
 # Bedrock client
 bedrock = boto3.client('bedrock-runtime', region_name='us-east-1')
 
+# Bedrock request pieces that do not change between insight requests
+BEDROCK_MODEL_ID = "us.anthropic.claude-sonnet-4-20250514-v1:0"
+
+_INSIGHT_PROMPT_TEMPLATE = """Based on the following economic letter content, please answer this question: {question}
+
+Economic Letter Content:
+{content}
+
+Please provide a clear, concise, and insightful analysis based on the content provided.
+Format your response using markdown for better readability:
+- Use **bold** for key points and important terms
+- Use bullet points or numbered lists for structured information
+- Use headers (##, ###) to organize different sections of your analysis
+- Use *italics* for emphasis where appropriate
+- Use > blockquotes for important quotes from the letter
+"""
+
+_BEDROCK_BODY_SKELETON = {
+    "anthropic_version": "bedrock-2023-05-31",
+    "max_tokens": 1000,
+    "messages": None
+}
+
+# Letter links on the listing page, and the year embedded in a letter URL
+_LETTER_HREF = re.compile(r'/economic-letter/\d{4}/')
+_YEAR_IN_URL = re.compile(r'/(\d{4})/')
+
+# Selectors for a letter's main content area, compiled once to XPath
+_CONTENT_SELECTORS = [
+    CSSSelector(selector)
+    for selector in [
+        '.article-content',
+        '.content',
+        '.post-content',
+        'article',
+        '.main-content'
+    ]
+]
+
 class EconomicLetter(BaseModel):
     title: str
     url: str
@@ -49,7 +107,7 @@ class InsightRequest(BaseModel):
 class InsightResponse(BaseModel):
     insight: str
 
-def scrape_economic_letters(limit: int = 10) -> List[Dict]:
+async def scrape_economic_letters(limit: int = 10) -> List[Dict]:
     """Scrape economic letters from FRBSF website with database caching"""
     
     # First, try to get from cache
@@ -63,47 +121,62 @@ def scrape_economic_letters(limit: int = 10) -> List[Dict]:
     letters_url = "https://www.frbsf.org/research-and-insights/publications/economic-letter/"
     
     try:
-        response = requests.get(letters_url, timeout=10)
-        response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        letters = []
-        
-        # Find letter links - looking for article elements or similar containers
-        article_links = soup.find_all('a', href=re.compile(r'/economic-letter/\d{4}/'))
-        
-        # Get more letters than requested to build a good cache
-        max_letters = max(limit, 20)
-        
-        for link in article_links[:max_letters]:
-            letter_url = base_url + link.get('href') if link.get('href').startswith('/') else link.get('href')
-            title = link.get_text(strip=True)
+        async with httpx.AsyncClient(
+            timeout=10,
+            follow_redirects=True,
+            limits=httpx.Limits(max_connections=10)
+        ) as client:
+            response = await client.get(letters_url)
+            response.raise_for_status()
+            soup = BeautifulSoup(response.content, 'lxml')
             
-            if title and letter_url:
-                # Extract date from URL or title if possible
-                date_match = re.search(r'/(\d{4})/', letter_url)
-                date = date_match.group(1) if date_match else "Unknown"
-                
-                # Get letter content
-                content = scrape_letter_content(letter_url)
+            found_letters = []
+            
+            # Find letter links - looking for article elements or similar containers
+            article_links = soup.find_all('a', href=_LETTER_HREF)
+            
+            # Get more letters than requested to build a good cache
+            max_letters = max(limit, 20)
+            
+            for link in article_links[:max_letters]:
+                letter_url = base_url + link.get('href') if link.get('href').startswith('/') else link.get('href')
+                title = link.get_text(strip=True)
                 
-                letters.append({
-                    'title': title,
-                    'url': letter_url,
-                    'date': date,
-                    'summary': content[:500] + "..." if len(content) > 500 else content,
-                    'content': content
-                })
+                if title and letter_url:
+                    # Extract date from URL or title if possible
+                    date_match = _YEAR_IN_URL.search(letter_url)
+                    date = date_match.group(1) if date_match else "Unknown"
+                    found_letters.append((title, letter_url, date))
+            
+            # Get all letter contents concurrently
+            contents = await asyncio.gather(
+                *[scrape_letter_content(client, letter_url) for _, letter_url, _ in found_letters]
+            )
+        
+        letters = [
+            {
+                'title': title,
+                'url': letter_url,
+                'date': date,
+                'summary': content[:500] + "..." if len(content) > 500 else content,
+                'content': content
+            }
+            for (title, letter_url, date), content in zip(found_letters, contents)
+        ]
         
         # Store in database cache
         if letters:
-            success = db_manager.store_letters(letters)
+            success = await db_manager.store_letters(letters)
             if success:
                 print(f"💾 Stored {len(letters)} letters in database cache")
             else:
                 print("⚠️  Failed to store letters in database")
         
-        return letters[:limit]  # Return only requested amount
+        # Return only requested amount; like the cached listing, without content
+        return [
+            {key: value for key, value in letter.items() if key != 'content'}
+            for letter in letters[:limit]
+        ]
     
     except Exception as e:
         print(f"Error scraping letters: {e}")
@@ -114,36 +187,28 @@ def scrape_economic_letters(limit: int = 10) -> List[Dict]:
             return fallback_letters
         return []
 
-def scrape_letter_content(url: str) -> str:
+async def scrape_letter_content(client: httpx.AsyncClient, url: str) -> str:
     """Scrape the full content of an individual economic letter"""
     try:
-        response = requests.get(url, timeout=10)
+        response = await client.get(url)
         response.raise_for_status()
-        soup = BeautifulSoup(response.content, 'html.parser')
+        tree = lxml.html.fromstring(response.content)
         
         # Try to find the main content area
-        content_selectors = [
-            '.article-content',
-            '.content',
-            '.post-content',
-            'article',
-            '.main-content'
-        ]
-        
         content = ""
-        for selector in content_selectors:
-            content_div = soup.select_one(selector)
-            if content_div:
+        for selector in _CONTENT_SELECTORS:
+            content_divs = selector(tree)
+            if content_divs:
+                content_div = content_divs[0]
                 # Remove script and style elements
-                for script in content_div(["script", "style"]):
-                    script.decompose()
-                content = content_div.get_text(strip=True)
+                for script in content_div.xpath('.//script|.//style'):
+                    script.drop_tree()
+                content = _element_text(content_div)
                 break
         
         # If no specific content area found, get all paragraph text
         if not content:
-            paragraphs = soup.find_all('p')
-            content = ' '.join([p.get_text(strip=True) for p in paragraphs])
+            content = ' '.join([_element_text(p) for p in tree.iter('p')])
         
         return content
     
@@ -151,7 +216,11 @@ def scrape_letter_content(url: str) -> str:
         print(f"Error scraping letter content from {url}: {e}")
         return "Content could not be retrieved."
 
-def get_llm_insight(content: str, question: str, letter_url: str = "") -> str:
+def _element_text(element) -> str:
+    """Concatenate an element's stripped text pieces, like BeautifulSoup's get_text(strip=True)"""
+    return ''.join(text.strip() for text in element.itertext())
+
+async def get_llm_insight(content: str, question: str, letter_url: str = "") -> str:
     """Get insights from AWS Bedrock Claude model with database caching"""
     
     # First, try to get from cache
@@ -164,44 +233,28 @@ def get_llm_insight(content: str, question: str, letter_url: str = "") -> str:
     print("🤖 Cache miss - generating new AI insight")
     
     try:
-        prompt = f"""
-        Based on the following economic letter content, please answer this question: {question}
-
-        Economic Letter Content:
-        {content}
-
-        Please provide a clear, concise, and insightful analysis based on the content provided.
-        Format your response using markdown for better readability:
-        - Use **bold** for key points and important terms
-        - Use bullet points or numbered lists for structured information
-        - Use headers (##, ###) to organize different sections of your analysis
-        - Use *italics* for emphasis where appropriate
-        - Use > blockquotes for important quotes from the letter
-        """
-
-        body = {
-            "anthropic_version": "bedrock-2023-05-31",
-            "max_tokens": 1000,
-            "messages": [
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        }
+        body = _BEDROCK_BODY_SKELETON.copy()
+        body["messages"] = [
+            {
+                "role": "user",
+                "content": _INSIGHT_PROMPT_TEMPLATE.format_map({"question": question, "content": content})
+            }
+        ]
 
-        response = bedrock.invoke_model(
-            modelId="us.anthropic.claude-sonnet-4-20250514-v1:0",
-            body=json.dumps(body),
+        # boto3 is blocking; keep the event loop free while Bedrock responds
+        response = await asyncio.to_thread(
+            bedrock.invoke_model,
+            modelId=BEDROCK_MODEL_ID,
+            body=orjson.dumps(body),
             contentType="application/json"
         )
 
-        response_body = json.loads(response['body'].read())
+        response_body = orjson.loads(response['body'].read())
         insight_text = response_body['content'][0]['text']
         
         # Store in database cache
         if letter_url and insight_text:
-            success = db_manager.store_insight(letter_url, question, insight_text)
+            success = await db_manager.store_insight(letter_url, question, insight_text)
             if success:
                 print("💾 Stored insight in database cache")
             else:
@@ -228,7 +281,7 @@ async def get_letters(page: int = 0, limit: int = 10):
         
         # If no cached letters, try to scrape new ones
         if not letters and page == 0:
-            letters = scrape_economic_letters(limit=limit)
+            letters = await scrape_economic_letters(limit=limit)
             has_more = len(letters) >= limit
         
         return {
@@ -240,11 +293,24 @@ async def get_letters(page: int = 0, limit: int = 10):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error fetching letters: {str(e)}")
 
+@app.get("/api/letter/{letter_url:path}")
+async def get_letter(letter_url: str):
+    """Get a single letter with its full content"""
+    try:
+        from urllib.parse import unquote
+        decoded_url = unquote(letter_url)
+        letter = db_manager.get_letter(decoded_url)
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Error fetching letter: {str(e)}")
+    if not letter:
+        raise HTTPException(status_code=404, detail="Letter not found")
+    return letter
+
 @app.post("/api/insights", response_model=InsightResponse)
 async def get_insights(request: InsightRequest):
     """Generate insights for a specific letter and question"""
     try:
-        insight = get_llm_insight(request.letter_content, request.question, request.letter_url)
+        insight = await get_llm_insight(request.letter_content, request.question, request.letter_url)
         return InsightResponse(insight=insight)
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error generating insight: {str(e)}")
@@ -262,7 +328,7 @@ async def get_cache_stats():
 async def clear_cache(cache_type: str = None):
     """Clear cache entries"""
     try:
-        db_manager.clear_cache(cache_type)
+        await db_manager.clear_cache(cache_type)
         return {"message": f"Cache cleared successfully" + (f" for type: {cache_type}" if cache_type else "")}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error clearing cache: {str(e)}")
@@ -272,9 +338,9 @@ async def refresh_letters():
     """Force refresh of letters from source (bypass cache)"""
     try:
         # Clear the letters cache first
-        db_manager.clear_cache("letters_list")
+        await db_manager.clear_cache("letters_list")
         # Then fetch fresh data
-        letters = scrape_economic_letters(limit=20)  # Get more letters on refresh
+        letters = await scrape_economic_letters(limit=20)  # Get more letters on refresh
         return {"message": f"Refreshed {len(letters)} letters", "count": len(letters)}
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error refreshing letters: {str(e)}")
@@ -294,7 +360,7 @@ async def get_question_history(letter_url: str):
 async def delete_question(question_id: int):
     """Delete a specific question and its answer"""
     try:
-        success = db_manager.delete_question(question_id)
+        success = await db_manager.delete_question(question_id)
         if success:
             return {"message": "Question deleted successfully"}
         else: